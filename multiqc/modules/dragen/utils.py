@@ -16,15 +16,20 @@ elif config.base_count_multiplier == 0.000000001:
 
 
 class Metric:
+    __slots__ = ('id', 'pct_id', 'title', 'in_genstats', 'in_own_tabl', 'unit', 'descr', 'pct_descr', 'fmt',
+                 'modify', 'namespace', 'precision', 'the_higher_the_worse')
+
     def __init__(self, id, title, in_genstats=None, in_own_tabl=None, unit=None,
                  descr=None, fmt=None, modify=None, namespace=None, precision=None,
                  the_higher_the_worse=False):
         self.id = id
+        self.pct_id = id + ' pct'
         self.title = title
         self.in_genstats = in_genstats
         self.in_own_tabl = in_own_tabl
         self.unit = unit
         self.descr = descr
+        self.pct_descr = descr.replace(', {}', '').replace('Number of ', '% of ') if descr is not None else None
         self.fmt = fmt
         self.modify = modify
         self.namespace = namespace
@@ -33,6 +38,8 @@ class Metric:
 
 
 def make_headers(parsed_metric_ids, metrics):
+    parsed_metric_ids = frozenset(parsed_metric_ids)
+
     # Init general stats table
     genstats_headers = OrderedDict()
 
@@ -62,11 +69,11 @@ def make_headers(parsed_metric_ids, metrics):
         elif metric.namespace == 'Variants':
             col['scale'] = 'Purples'
 
-        if metric.id + ' pct' in parsed_metric_ids:
+        if metric.pct_id in parsed_metric_ids:
             # if % value is available, showing it instead of the number value; the number value will be hidden
             pct_col = dict(
                 col,
-                description=metric.descr.replace(', {}', '').replace('Number of ', '% of '),
+                description=metric.pct_descr,
                 max=100,
                 suffix='%',
             )
@@ -84,9 +91,9 @@ def make_headers(parsed_metric_ids, metrics):
 
             if metric.in_own_tabl is not None:
                 show = metric.in_own_tabl == '%'
-                own_tabl_headers[metric.id + ' pct'] = dict(pct_col, hidden=not show)
+                own_tabl_headers[metric.pct_id] = dict(pct_col, hidden=not show)
             if metric.in_genstats is not None and metric.in_own_tabl != '#':
-                genstats_headers[metric.id + ' pct'] = dict(pct_col, hidden=metric.in_genstats == 'hid')
+                genstats_headers[metric.pct_id] = dict(pct_col, hidden=metric.in_genstats == 'hid')
 
         if metric.unit == 'reads':
             col['description'] = col['description'].format(config.read_count_desc)
@@ -126,4 +133,43 @@ def make_headers(parsed_metric_ids, metrics):
 
 
 def exist_and_number(data, *metrics):
-    return all(isinstance(data.get(m, None), int) or isinstance(data.get(m, None), float) for m in metrics)
+    return is_number(*(data.get(m, None) for m in metrics))
+
+
+def is_number(*values):
+    return all(isinstance(v, (int, float)) for v in values)
+
+
+NUMBER_START_CHARS = frozenset('0123456789+-.')
+# inf, infinity and nan spellings that float() accepts
+SPECIAL_FLOAT_START_CHARS = frozenset('iInN')
+
+
+def looks_like_number(value):
+    # cheap check on the first character, so that most non-numeric values are not run through int()/float() just to fail
+    first_char = value.lstrip()[:1]
+    return first_char in NUMBER_START_CHARS or first_char in SPECIAL_FLOAT_START_CHARS
+
+
+def parse_number(value):
+    first_char = value.lstrip()[:1]
+    if first_char in NUMBER_START_CHARS and '.' not in value:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    if first_char in NUMBER_START_CHARS or first_char in SPECIAL_FLOAT_START_CHARS:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_float(value):
+    if looks_like_number(value):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return value
@@ -5,7 +5,7 @@ import re
 from multiqc.modules.base_module import BaseMultiqcModule
 from multiqc.plots import table
 
-from .utils import make_headers, Metric, exist_and_number
+from .utils import make_headers, Metric, is_number, parse_float, parse_number
 
 # Initialise the logger
 import logging
@@ -14,6 +14,8 @@ log = logging.getLogger(__name__)
 
 NAMESPACE = 'DRAGEN variant calling'
 
+SAMPLE_NAME_RE = re.compile(r'(.*).vc_metrics.csv')
+
 
 class DragenVCMetrics(BaseMultiqcModule):
     def add_vc_metrics(self):
@@ -21,20 +23,22 @@ class DragenVCMetrics(BaseMultiqcModule):
 
         for f in self.find_log_files('dragen/vc_metrics'):
             data = parse_vc_metrics_file(f)
+            if not data:
+                continue
             if f['s_name'] in data_by_sample:
                 log.debug('Duplicate sample name found! Overwriting: {}'.format(f['s_name']))
             self.add_data_source(f, section='stats')
             data_by_sample[f['s_name']] = data
 
+        if not data_by_sample:
+            return set()
+
         # Filter to strip out ignored sample names:
         data_by_sample = self.ignore_samples(data_by_sample)
         if not data_by_sample:
             return set()
 
-        all_metric_names = set()
-        for sn, sdata in data_by_sample.items():
-            for m in sdata.keys():
-                all_metric_names.add(m)
+        all_metric_names = set().union(*data_by_sample.values())
 
         gen_stats_headers, vc_table_headers = make_headers(all_metric_names, VC_METRICS)
 
@@ -55,9 +59,9 @@ class DragenVCMetrics(BaseMultiqcModule):
         return data_by_sample.keys()
 
 
-VC_METRICS = [Metric(m.id, m.title, in_genstats=m.in_genstats, in_own_tabl=m.in_own_tabl, descr=m.descr, unit=m.unit,
-                     namespace=m.namespace or NAMESPACE, the_higher_the_worse=m.the_higher_the_worse)
-              for m in [
+VC_METRICS = tuple(Metric(m.id, m.title, in_genstats=m.in_genstats, in_own_tabl=m.in_own_tabl, descr=m.descr, unit=m.unit,
+                         namespace=m.namespace or NAMESPACE, the_higher_the_worse=m.the_higher_the_worse)
+                  for m in [
     # id_in_data                                        title (display name)   gen_stats  vc_table  unit description
     # Read stats:
     Metric('Total'                                      , 'Variants'            , '#'  , '#'  , '', 'Total number of variants (SNPs + MNPs + INDELS).'),
@@ -105,7 +109,7 @@ VC_METRICS = [Metric(m.id, m.title, in_genstats=m.in_genstats, in_own_tabl=m.in_
     Metric('Filtered SNPs'                              , 'Filt SNP'            , 'hid', '%'  , '', 'Number of raw SNPs minus the number of PASSed SNPs', the_higher_the_worse=True),
     Metric('Filtered indels'                            , 'Filt indel'          , 'hid', '%'  , '', 'Number of raw indels minus the number of PASSed indels', the_higher_the_worse=True),
     Metric('Reads Processed'                            , 'VC reads'            , None , '#'  , 'reads', 'The number of reads used for variant calling, excluding any duplicate marked reads and reads falling outside of the target region'),
-]]
+])
 
 
 def parse_vc_metrics_file(f):
@@ -159,89 +163,92 @@ def parse_vc_metrics_file(f):
     VARIANT CALLER POSTFILTER,T_SRR7890936_50pc,Percent Autosome Callability,NA
     """
 
-    f['s_name'] = re.search(r'(.*).vc_metrics.csv', f['fn']).group(1)
+    f['s_name'] = SAMPLE_NAME_RE.search(f['fn']).group(1)
 
     summary_data = dict()
     prefilter_data = dict()
     postfilter_data = dict()
 
+    data_by_analysis = {
+        'VARIANT CALLER SUMMARY': summary_data,
+        'VARIANT CALLER PREFILTER': prefilter_data,
+        'VARIANT CALLER POSTFILTER': postfilter_data,
+    }
+
     for line in f['f'].splitlines():
         fields = line.split(',')
-        analysis = fields[0]
+        if len(fields) < 4:
+            continue
+        data = data_by_analysis.get(fields[0])
+        if data is None:
+            continue
         # sample = fields[1]
         metric = fields[2]
-        value = fields[3]
-
-        try:
-            value = int(value)
-        except ValueError:
-            try:
-                value = float(value)
-            except ValueError:
-                pass
-
-        percentage = None
-        if len(fields) > 4:  # percentage
-            percentage = fields[4]
-            try:
-                percentage = float(percentage)
-            except ValueError:
-                pass
-
-        if analysis == 'VARIANT CALLER SUMMARY':
-            summary_data[metric] = value
-
-        if analysis == 'VARIANT CALLER PREFILTER':
-            prefilter_data[metric] = value
-
-        if analysis == 'VARIANT CALLER POSTFILTER':
-            postfilter_data[metric] = value
-            if percentage is not None:
-                postfilter_data[metric + ' pct'] = percentage
+        data[metric] = parse_number(fields[3])
 
-    # adding few more metrics: total insertions, deletions and indels numbers
-    for data in [prefilter_data, postfilter_data]:
-        if exist_and_number(data, 'Insertions (Hom)', 'Insertions (Het)'):
-            data['Insertions'] = data['Insertions (Hom)'] + data['Insertions (Het)']
-
-        if exist_and_number(data, 'Deletions (Hom)', 'Deletions (Het)'):
-            data['Deletions'] = data['Deletions (Hom)'] + data['Deletions (Het)']
-
-        if exist_and_number(data, 'Insertions', 'Deletions'):
-            data['Indels'] = data['Insertions'] + data['Deletions']
+        # percentages are only kept for post-filtered variants
+        if data is postfilter_data and len(fields) > 4:
+            data[metric + ' pct'] = parse_float(fields[4])
 
-        if exist_and_number(data, 'Total') and data['Total'] != 0:
-            if exist_and_number(data, 'Insertions'):
-                data['Insertions pct'] = data['Insertions'] / data['Total'] * 100.0
-            if exist_and_number(data, 'Deletions'):
-                data['Deletions pct'] = data['Deletions'] / data['Total'] * 100.0
-            if exist_and_number(data, 'Indels'):
-                data['Indels pct'] = data['Indels'] / data['Total'] * 100.0
+    # adding few more metrics: total insertions, deletions and indels numbers
+    for data in (prefilter_data, postfilter_data):
+        ins_hom = data.get('Insertions (Hom)')
+        ins_het = data.get('Insertions (Het)')
+        del_hom = data.get('Deletions (Hom)')
+        del_het = data.get('Deletions (Het)')
+        total = data.get('Total')
+
+        insertions = data.get('Insertions')
+        if is_number(ins_hom, ins_het):
+            insertions = data['Insertions'] = ins_hom + ins_het
+
+        deletions = data.get('Deletions')
+        if is_number(del_hom, del_het):
+            deletions = data['Deletions'] = del_hom + del_het
+
+        indels = data.get('Indels')
+        if is_number(insertions, deletions):
+            indels = data['Indels'] = insertions + deletions
+
+        if is_number(total) and total != 0:
+            if is_number(insertions):
+                data['Insertions pct'] = insertions / total * 100.0
+            if is_number(deletions):
+                data['Deletions pct'] = deletions / total * 100.0
+            if is_number(indels):
+                data['Indels pct'] = indels / total * 100.0
 
     data = postfilter_data
     data.update(summary_data)
 
+    total = data.get('Total')
+    snps = data.get('SNPs')
+    indels = data.get('Indels')
+    pre_total = prefilter_data.get('Total')
+    pre_snps = prefilter_data.get('SNPs')
+    pre_indels = prefilter_data.get('Indels')
+
     # we are not really interested in all the details of pre-filtered variants, however
     # it would be nice to report how much we filtered out
-    if exist_and_number(data, 'Total') and exist_and_number(prefilter_data, 'Total'):
-        data['Filtered vars'] = prefilter_data['Total'] - data['Total']
+    if is_number(total, pre_total):
+        data['Filtered vars'] = pre_total - total
 
-    if exist_and_number(data, 'SNPs') and exist_and_number(prefilter_data, 'SNPs'):
-        data['Filtered SNPs'] = prefilter_data['SNPs'] - data['SNPs']
+    if is_number(snps, pre_snps):
+        data['Filtered SNPs'] = pre_snps - snps
 
-    if exist_and_number(data, 'Indels') and exist_and_number(prefilter_data, 'Indels'):
-        data['Filtered indels'] = prefilter_data['Indels'] - data['Indels']
+    if is_number(indels, pre_indels):
+        data['Filtered indels'] = pre_indels - indels
 
-    if exist_and_number(prefilter_data, 'Total') and exist_and_number(data, 'Filtered vars') \
-             and prefilter_data['Total'] != 0:
-        data['Filtered vars pct'] = data['Filtered vars'] / prefilter_data['Total'] * 100.0
+    filt_vars = data.get('Filtered vars')
+    if is_number(pre_total, filt_vars) and pre_total != 0:
+        data['Filtered vars pct'] = filt_vars / pre_total * 100.0
 
-    if exist_and_number(prefilter_data, 'SNPs') and exist_and_number(data, 'Filtered SNPs') \
-             and prefilter_data['SNPs'] != 0:
-        data['Filtered SNPs pct'] = data['Filtered SNPs'] / prefilter_data['SNPs'] * 100.0
+    filt_snps = data.get('Filtered SNPs')
+    if is_number(pre_snps, filt_snps) and pre_snps != 0:
+        data['Filtered SNPs pct'] = filt_snps / pre_snps * 100.0
 
-    if exist_and_number(prefilter_data, 'Indels') and exist_and_number(data, 'Filtered Indels') \
-             and prefilter_data['Indels'] != 0:
-        data['Filtered indels pct'] = data['Filtered indels'] / prefilter_data['Indels'] * 100.0
+    filt_indels = data.get('Filtered indels')
+    if is_number(pre_indels, filt_indels) and pre_indels != 0:
+        data['Filtered indels pct'] = filt_indels / pre_indels * 100.0
 
     return data